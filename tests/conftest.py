@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the Mergington High School API tests
+
+The app module is imported here once per process, before any test module is
+collected, so every test file in that process reuses the same import. Each
+xdist worker is a separate interpreter and imports the app on its own.
+"""
+
+import pytest
+
+# src/ is put on sys.path by the pythonpath setting in pytest.ini
+import app as app_module
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI application under test"""
+    return app_module.app
+
+
+@pytest.fixture(scope="session")
+def activities():
+    """The app's in-memory activity database"""
+    return app_module.activities
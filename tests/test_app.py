@@ -3,92 +3,167 @@ Tests for the Mergington High School API
 """
 
 import pytest
-from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 
-# Add src directory to path to import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from app import app, activities
+# Test-owned seed data, built once at import time. It is not restored
+# directly: it feeds _STATIC/_INITIAL_PARTICIPANTS below and the per-activity
+# parametrize list. Restoring is opt-in via reset_activities/seeded_activities.
+_SEED = {
+    "Basketball Team": {
+        "description": "Join our competitive basketball team and compete in league games",
+        "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 15,
+        "participants": ["alex@mergington.edu"]
+    },
+    "Tennis Club": {
+        "description": "Learn tennis skills and participate in friendly matches",
+        "schedule": "Saturdays, 10:00 AM - 12:00 PM",
+        "max_participants": 16,
+        "participants": ["jessica@mergington.edu"]
+    },
+    "Art Studio": {
+        "description": "Explore painting, drawing, and sculpture techniques",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 18,
+        "participants": ["sarah@mergington.edu"]
+    },
+    "Drama Club": {
+        "description": "Perform in theatrical productions and develop acting skills",
+        "schedule": "Thursdays, 4:00 PM - 5:30 PM",
+        "max_participants": 25,
+        "participants": ["marcus@mergington.edu", "lucas@mergington.edu"]
+    },
+    "Debate Team": {
+        "description": "Develop argumentation and public speaking skills through competitive debate",
+        "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 14,
+        "participants": ["rachel@mergington.edu"]
+    },
+    "Science Club": {
+        "description": "Conduct experiments and explore scientific concepts through hands-on projects",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 20,
+        "participants": ["noah@mergington.edu", "ava@mergington.edu"]
+    },
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    }
+}
 
+# Fields the API never mutates, and the participant lists it does
+_STATIC = {
+    name: {**fields, "participants": None} for name, fields in _SEED.items()
+}
+_INITIAL_PARTICIPANTS = {
+    name: tuple(fields["participants"]) for name, fields in _SEED.items()
+}
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
 
+# Pre-encoded endpoint URLs; the email is passed as a query param
+SIGNUP_BBALL = "/activities/Basketball%20Team/signup"
+SIGNUP_TENNIS = "/activities/Tennis%20Club/signup"
+SIGNUP_MISSING = "/activities/Nonexistent%20Activity/signup"
+UNREG_BBALL = "/activities/Basketball%20Team/unregister"
+UNREG_DRAMA = "/activities/Drama%20Club/unregister"
+UNREG_MISSING = "/activities/Nonexistent%20Activity/unregister"
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities before each test"""
-    activities.clear()
-    activities.update({
-        "Basketball Team": {
-            "description": "Join our competitive basketball team and compete in league games",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["alex@mergington.edu"]
-        },
-        "Tennis Club": {
-            "description": "Learn tennis skills and participate in friendly matches",
-            "schedule": "Saturdays, 10:00 AM - 12:00 PM",
-            "max_participants": 16,
-            "participants": ["jessica@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and sculpture techniques",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["sarah@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Perform in theatrical productions and develop acting skills",
-            "schedule": "Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 25,
-            "participants": ["marcus@mergington.edu", "lucas@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop argumentation and public speaking skills through competitive debate",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 14,
-            "participants": ["rachel@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore scientific concepts through hands-on projects",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 20,
-            "participants": ["noah@mergington.edu", "ava@mergington.edu"]
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        }
-    })
-    yield
+
+# Async tests run on the session event loop shared with the client fixture
+asyncio_session = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client(app):
+    """Create an async client bound directly to the ASGI app, shared across the session
+
+    ASGITransport does not send lifespan events, so the router's lifespan
+    context is entered here, once, for the whole session. This is the
+    router-level lifespan only, not the ASGI ``lifespan`` protocol that
+    ``with TestClient(app)`` drives: middleware never sees startup and
+    ``scope["state"]`` is not populated from lifespan state. The app defines
+    no lifespan handlers, so nothing depends on either.
+    """
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+
+
+@pytest.fixture(scope="session")
+def static_activities(activities):
+    """Install the test-owned seed in place of the app's data, once per session"""
     activities.clear()
+    activities.update({name: dict(fields) for name, fields in _STATIC.items()})
+    return activities
+
+
+def _restore_participants(activities):
+    """Restore the participant lists, the only fields the API mutates"""
+    for name, participants in _INITIAL_PARTICIPANTS.items():
+        activities[name]["participants"] = list(participants)
+
+
+@pytest.fixture
+def reset_activities(static_activities):
+    """Reset activities before a test that mutates them
+
+    ``activities`` is process-global state owned by the app module. Under
+    pytest-xdist (opt-in, e.g. ``pytest -n auto``) every worker imports its
+    own copy, so the reset only ever touches the current worker's dict and
+    must not be relied on across workers.
+
+    Nothing restores the dict after a test, so tests that do not request
+    this fixture see whatever state the previous test on the worker left.
+    """
+    _restore_participants(static_activities)
+
+
+@pytest.fixture(scope="module")
+def seeded_activities(static_activities):
+    """Restore the seed state once for the module-scoped read-only fixtures"""
+    _restore_participants(static_activities)
+    return static_activities
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def activities_response(client, seeded_activities):
+    """Fetch /activities once, from the seed state, for read-only tests
 
+    The cache is per worker: under ``pytest -n auto`` (``--dist load``) each
+    worker that receives one of these tests seeds and fetches its own copy.
+    """
+    return await client.get("/activities")
 
+
+@pytest.fixture(scope="module")
+def all_activities(activities_response):
+    """Parsed body of the cached /activities response"""
+    return activities_response.json()
+
+
+@asyncio_session
 class TestRoot:
     """Test root endpoint"""
     
-    def test_root_redirect(self, client):
+    async def test_root_redirect(self, client):
         """Test that root redirects to static index.html"""
-        response = client.get("/", follow_redirects=False)
+        response = await client.get("/", follow_redirects=False)
         assert response.status_code == 307
         assert "/static/index.html" in response.headers["location"]
 
@@ -96,129 +171,112 @@ class TestRoot:
 class TestActivitiesEndpoint:
     """Test the /activities endpoint"""
     
-    def test_get_activities(self, client):
+    def test_get_activities(self, activities_response, all_activities):
         """Test retrieving all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, dict)
-        assert "Basketball Team" in data
-        assert "Tennis Club" in data
-        assert len(data) == 9
+        assert activities_response.status_code == 200
+        assert isinstance(all_activities, dict)
+        assert "Basketball Team" in all_activities
+        assert "Tennis Club" in all_activities
+        assert len(all_activities) == 9
 
-    def test_activity_has_required_fields(self, client):
+    # One item per activity so --dist load can spread them across workers
+    @pytest.mark.parametrize("name", list(_SEED))
+    def test_activity_has_required_fields(self, all_activities, name):
         """Test that each activity has required fields"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        for activity_name, activity_data in data.items():
-            assert "description" in activity_data
-            assert "schedule" in activity_data
-            assert "max_participants" in activity_data
-            assert "participants" in activity_data
-            assert isinstance(activity_data["participants"], list)
-
-    def test_activities_have_initial_participants(self, client):
+        activity_data = all_activities[name]
+        assert "description" in activity_data
+        assert "schedule" in activity_data
+        assert "max_participants" in activity_data
+        assert "participants" in activity_data
+        assert isinstance(activity_data["participants"], list)
+
+    def test_activities_have_initial_participants(self, all_activities):
         """Test that activities have initial participants"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        assert len(data["Basketball Team"]["participants"]) == 1
-        assert "alex@mergington.edu" in data["Basketball Team"]["participants"]
-        assert len(data["Drama Club"]["participants"]) == 2
+        assert len(all_activities["Basketball Team"]["participants"]) == 1
+        assert "alex@mergington.edu" in all_activities["Basketball Team"]["participants"]
+        assert len(all_activities["Drama Club"]["participants"]) == 2
 
 
+@asyncio_session
 class TestSignupEndpoint:
     """Test the signup endpoint"""
     
-    def test_successful_signup(self, client):
-        """Test successful signup for an activity"""
-        response = client.post("/activities/Basketball Team/signup?email=newstudent@mergington.edu")
+    async def test_successful_signup(self, client, activities, reset_activities):
+        """Test successful signup adds the participant to the list"""
+        email = "newstudent@mergington.edu"
+        response = await client.post(SIGNUP_BBALL, params={"email": email})
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
+        assert email in data["message"]
+        assert email in activities["Basketball Team"]["participants"]
 
-    def test_signup_updates_participants_list(self, client):
-        """Test that signup actually adds participant to the list"""
-        email = "newstudent@mergington.edu"
-        client.post(f"/activities/Basketball Team/signup?email={email}")
-        
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Basketball Team"]["participants"]
-
-    def test_signup_nonexistent_activity(self, client):
+    async def test_signup_nonexistent_activity(self, client):
         """Test signup for activity that doesn't exist"""
-        response = client.post("/activities/Nonexistent Activity/signup?email=test@mergington.edu")
+        response = await client.post(SIGNUP_MISSING, params={"email": "test@mergington.edu"})
         assert response.status_code == 404
         assert "Activity not found" in response.json()["detail"]
 
-    def test_signup_duplicate_student(self, client):
+    async def test_signup_duplicate_student(self, client, reset_activities):
         """Test that student can't signup for same activity twice"""
         email = "alex@mergington.edu"
-        response = client.post(f"/activities/Basketball Team/signup?email={email}")
+        response = await client.post(SIGNUP_BBALL, params={"email": email})
         assert response.status_code == 400
         assert "already signed up" in response.json()["detail"]
 
-    def test_signup_multiple_different_activities(self, client):
+    async def test_signup_multiple_different_activities(self, client, activities, reset_activities):
         """Test that a student can sign up for different activities"""
         email = "multiactivity@mergington.edu"
         
-        response1 = client.post(f"/activities/Basketball Team/signup?email={email}")
+        response1 = await client.post(SIGNUP_BBALL, params={"email": email})
         assert response1.status_code == 200
         
-        response2 = client.post(f"/activities/Tennis Club/signup?email={email}")
+        response2 = await client.post(SIGNUP_TENNIS, params={"email": email})
         assert response2.status_code == 200
         
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Basketball Team"]["participants"]
-        assert email in data["Tennis Club"]["participants"]
+        assert email in activities["Basketball Team"]["participants"]
+        assert email in activities["Tennis Club"]["participants"]
 
 
+@asyncio_session
 class TestUnregisterEndpoint:
     """Test the unregister endpoint"""
     
-    def test_unregister_participant(self, client):
+    async def test_unregister_participant(self, client, reset_activities):
         """Test unregistering a participant from an activity"""
         email = "alex@mergington.edu"
-        response = client.delete(f"/activities/Basketball Team/unregister?email={email}")
+        response = await client.delete(UNREG_BBALL, params={"email": email})
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
 
-    def test_unregister_removes_participant(self, client):
+    async def test_unregister_removes_participant(self, client, activities, reset_activities):
         """Test that unregister actually removes participant"""
         email = "alex@mergington.edu"
-        client.delete(f"/activities/Basketball Team/unregister?email={email}")
+        await client.delete(UNREG_BBALL, params={"email": email})
         
-        response = client.get("/activities")
-        data = response.json()
-        assert email not in data["Basketball Team"]["participants"]
+        assert email not in activities["Basketball Team"]["participants"]
 
-    def test_unregister_nonexistent_activity(self, client):
+    async def test_unregister_nonexistent_activity(self, client):
         """Test unregister from activity that doesn't exist"""
-        response = client.delete("/activities/Nonexistent Activity/unregister?email=test@mergington.edu")
+        response = await client.delete(UNREG_MISSING, params={"email": "test@mergington.edu"})
         assert response.status_code == 404
 
-    def test_unregister_not_registered_student(self, client):
+    async def test_unregister_not_registered_student(self, client, reset_activities):
         """Test unregistering a student not in the activity"""
-        response = client.delete("/activities/Basketball Team/unregister?email=notregistered@mergington.edu")
+        response = await client.delete(UNREG_BBALL, params={"email": "notregistered@mergington.edu"})
         assert response.status_code == 400
 
-    def test_unregister_multiple_participants(self, client):
+    async def test_unregister_multiple_participants(self, client, activities, reset_activities):
         """Test unregistering one of multiple participants"""
         # Drama Club has 2 participants
-        response = client.get("/activities")
-        initial_count = len(response.json()["Drama Club"]["participants"])
+        initial_count = len(activities["Drama Club"]["participants"])
         assert initial_count == 2
         
         # Unregister one
-        client.delete("/activities/Drama Club/unregister?email=marcus@mergington.edu")
+        await client.delete(UNREG_DRAMA, params={"email": "marcus@mergington.edu"})
         
-        response = client.get("/activities")
-        data = response.json()
-        assert len(data["Drama Club"]["participants"]) == 1
-        assert "lucas@mergington.edu" in data["Drama Club"]["participants"]
-        assert "marcus@mergington.edu" not in data["Drama Club"]["participants"]
+        participants = activities["Drama Club"]["participants"]
+        assert len(participants) == 1
+        assert "lucas@mergington.edu" in participants
+        assert "marcus@mergington.edu" not in participants